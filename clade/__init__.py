@@ -225,7 +225,7 @@ class Clade:
         ext_objs = []
 
         for ext_name in ext_names:
-            already_initialized = [x.name for x in ext_objs]
+            already_initialized = {x.name for x in ext_objs}
             ext_objs.extend(self.__create_ext_obj_list(ext_name, already_initialized))
 
         for ext_obj in [e for e in ext_objs if e.name not in self.extensions]:
@@ -243,8 +243,8 @@ class Clade:
         List can be filtered using already_initialized argument.
         """
 
-        if not already_initialized:
-            already_initialized = []
+        if already_initialized is None:
+            already_initialized = set()
 
         if ext_name in already_initialized:
             return []
@@ -254,7 +254,7 @@ class Clade:
         ext_objs = []
 
         for req_name in e.requires:
-            already_initialized += [x.name for x in ext_objs]
+            already_initialized.update(x.name for x in ext_objs)
             r_ext_objs = self.__create_ext_obj_list(req_name, already_initialized)
             ext_objs.extend(r_ext_objs)
 
@@ -39,11 +39,15 @@ def iter_cmds_by_which(cmds_file, which_list):
         cmds_file: Path to the txt file with intercepted commands.
         which_list: A list of strings to filter command by 'which' field.
     """
+    if not which_list:
+        return
+
+    # Make a regex that matches if any of our regexes match.
+    which_search = re.compile("|".join("(?:{})".format(which) for which in which_list)).search
+
     for cmd in iter_cmds(cmds_file):
-        for which in which_list:
-            if re.search(which, cmd["which"]):
-                yield cmd
-                break
+        if which_search(cmd["which"]):
+            yield cmd
 
 
 def number_of_cmds_by_which(cmds_file, which_list):
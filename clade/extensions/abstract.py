@@ -14,8 +14,9 @@
 # limitations under the License.
 
 import abc
+import atexit
 import datetime
-import fnmatch
+import functools
 import glob
 import hashlib
 import importlib
@@ -33,6 +34,11 @@ import time
 import ujson
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from concurrent.futures import ProcessPoolExecutor
 
 import clade.cmds
@@ -46,6 +52,37 @@ handler.setFormatter(
 )
 logger.addHandler(handler)
 
+# Extension modules need to be imported only once per process
+_MODULES_IMPORTED = False
+
+
+def _json_default(obj):
+    # Sets are not serialized by orjson natively
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+
+    raise TypeError("Object of type {!r} is not JSON serializable".format(type(obj).__name__))
+
+
+def _write_bytes(file_name, data):
+    # Write data with unbuffered os.write() calls: orjson already produces
+    # a single contiguous bytes object, so buffering only adds copying
+    # On Windows file must be opened in binary mode explicitly,
+    # otherwise newlines are converted to CRLF
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    # Permissions are the same as for files created by open() (subject to umask)
+    fd = os.open(file_name, flags, 0o666)
+
+    try:
+        view = memoryview(data)
+
+        # os.write() may write less than requested
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
 
 class Extension(metaclass=abc.ABCMeta):
     """Parent interface class for parsing intercepted build commands.
@@ -61,6 +98,15 @@ class Extension(metaclass=abc.ABCMeta):
 
     __version__ = "1"
 
+    # Temporary root directories shared by all extensions with the same working directory
+    _temp_roots = dict()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Newly defined extension must be visible to find_subclass()
+        Extension._get_subclasses_by_name.cache_clear()
+
     def __init__(self, work_dir, conf=None):
         self.name = self.__class__.__name__
         self.work_dir = os.path.join(os.path.abspath(str(work_dir)), self.name)
@@ -69,7 +115,7 @@ class Extension(metaclass=abc.ABCMeta):
 
         if not hasattr(self, "requires"):
             self.requires = []
-        self.debug("Extension requirements: {!r}".format(self.requires))
+        self.debug("Extension requirements: {!r}", self.requires)
 
         self.extensions = dict()
 
@@ -87,8 +133,8 @@ class Extension(metaclass=abc.ABCMeta):
                 pass
             self.conf["force_meta_deleted"] = True
 
-        self.debug("Extension version: {}".format(self.ext_meta["version"]))
-        self.debug("Working directory: {}".format(self.work_dir))
+        self.debug("Extension version: {}", self.ext_meta["version"])
+        self.debug("Working directory: {}", self.work_dir)
 
     def is_parsed(self):
         """Returns True if build commands are already parsed."""
@@ -111,7 +157,8 @@ class Extension(metaclass=abc.ABCMeta):
                 self.log("Build commands are already parsed")
                 return
 
-            self.temp_dir = tempfile.mkdtemp()
+            self.temp_dir = os.path.join(self.__get_temp_root(), self.name)
+            os.makedirs(self.temp_dir, exist_ok=True)
             time_start = time.time()
 
             try:
@@ -122,7 +169,7 @@ class Extension(metaclass=abc.ABCMeta):
                 raise
             finally:
                 if os.path.exists(self.temp_dir):
-                    self.debug("Removing temp directory: {!r}".format(self.temp_dir))
+                    self.debug("Removing temp directory: {!r}", self.temp_dir)
                     shutil.rmtree(self.temp_dir)
 
                 self.ext_meta["time"] = str(
@@ -159,30 +206,60 @@ class Extension(metaclass=abc.ABCMeta):
 
             return dict()
 
-        self.debug("Loading {}".format(file_name))
+        self.debug("Loading {}", file_name)
+
+        if orjson:
+            with open(file_name, "rb") as fh:
+                return orjson.loads(fh.read())
+
         with open(file_name, "r") as fh:
             return ujson.load(fh)
 
-    def dump_data(self, data, file_name, indent=4):
-        """Dump data to a json file in the object working directory."""
+    def dump_data(self, data, file_name, indent=None):
+        """Dump data to a json file in the object working directory.
+
+        Json is written without indentation unless "pretty" option is set
+        or indent is specified explicitly. If orjson is available, any non-zero
+        indent means indentation with 2 spaces, since orjson does not support
+        other values.
+        """
 
         if not os.path.isabs(file_name):
             file_name = os.path.join(self.work_dir, file_name)
 
         os.makedirs(os.path.dirname(file_name), exist_ok=True)
 
-        self.debug("Dumping {}".format(file_name))
+        self.debug("Dumping {}", file_name)
+
+        if indent is None:
+            indent = 4 if self.conf.get("pretty") else 0
 
         try:
-            with open(file_name, "w") as fh:
-                ujson.dump(
-                    data,
-                    fh,
-                    sort_keys=True,
-                    indent=indent,
-                    ensure_ascii=False,
-                    escape_forward_slashes=False,
-                )
+            if orjson:
+                # orjson supports only 2 spaces indentation (see docstring)
+                option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                if indent:
+                    option |= orjson.OPT_INDENT_2
+
+                try:
+                    data_bytes = orjson.dumps(data, default=_json_default, option=option)
+                except orjson.JSONEncodeError as e:
+                    # orjson reports exceeded nesting depth as an encoding error
+                    if "Recursion limit" in str(e):
+                        raise RecursionError from e
+                    raise
+
+                _write_bytes(file_name, data_bytes)
+            else:
+                with open(file_name, "w") as fh:
+                    ujson.dump(
+                        data,
+                        fh,
+                        sort_keys=True,
+                        indent=indent,
+                        ensure_ascii=False,
+                        escape_forward_slashes=False,
+                    )
         except RecursionError:
             # This is a workaround, but it is rarely required
             self.warning(
@@ -203,7 +280,7 @@ class Extension(metaclass=abc.ABCMeta):
         data = dict()
 
         if files:
-            self.debug("Loading data from {!r}: {!r}".format(folder, files))
+            self.debug("Loading data from {!r}: {!r}", folder, files)
             for key in files:
                 file = os.path.join(
                     folder,
@@ -211,7 +288,7 @@ class Extension(metaclass=abc.ABCMeta):
                 )
                 data.update(self.load_data(file, raise_exception=False))
         else:
-            self.debug("Loading all data from {!r}".format(folder))
+            self.debug("Loading all data from {!r}", folder)
             for file in self.__get_all_files_in_folder(folder):
                 data.update(self.load_data(file, raise_exception=False))
 
@@ -227,7 +304,7 @@ class Extension(metaclass=abc.ABCMeta):
             )
 
         if files:
-            self.debug("Yielding data from {!r}: {!r}".format(folder, files))
+            self.debug("Yielding data from {!r}: {!r}", folder, files)
             for key in files:
                 file = os.path.join(
                     folder,
@@ -238,7 +315,7 @@ class Extension(metaclass=abc.ABCMeta):
                 for key in data:
                     yield key, data
         else:
-            self.debug("Yielding all data from {!r}".format(folder))
+            self.debug("Yielding all data from {!r}", folder)
             for file in self.__get_all_files_in_folder(folder):
                 data = self.load_data(file, raise_exception=False)
                 for key in data:
@@ -249,7 +326,7 @@ class Extension(metaclass=abc.ABCMeta):
 
     def dump_data_by_key(self, data, folder):
         """Dump data to multiple json files in the object working directory."""
-        self.debug("Dumping data to {!r}".format(folder))
+        self.debug("Dumping data to {!r}", folder)
 
         for key in data:
             to_dump = {key: data[key]}
@@ -260,6 +337,16 @@ class Extension(metaclass=abc.ABCMeta):
 
             self.dump_data(to_dump, file_name, indent=0)
 
+    def __get_temp_root(self):
+        clade_dir = os.path.dirname(self.work_dir)
+
+        if clade_dir not in Extension._temp_roots:
+            temp_root = tempfile.mkdtemp(prefix="clade-")
+            atexit.register(shutil.rmtree, temp_root, ignore_errors=True)
+            Extension._temp_roots[clade_dir] = temp_root
+
+        return Extension._temp_roots[clade_dir]
+
     def get_ext_version(self):
         version = self.__version__
 
@@ -420,7 +507,13 @@ class Extension(metaclass=abc.ABCMeta):
                 return
 
     def parse_cmds_in_parallel(self, cmds, unwrap, total_cmds=None):
-        if os.environ.get("CLADE_DEBUG"):
+        if self.conf.get("cpu_count"):
+            max_workers = self.conf.get("cpu_count")
+        else:
+            max_workers = os.cpu_count()
+
+        # There is no need to spawn worker processes if only one CPU can be used
+        if os.environ.get("CLADE_DEBUG") or max_workers == 1:
             if total_cmds:
                 self.log("Parsing {} commands".format(total_cmds))
 
@@ -428,11 +521,6 @@ class Extension(metaclass=abc.ABCMeta):
                 unwrap(self, cmd)
             return
 
-        if self.conf.get("cpu_count"):
-            max_workers = self.conf.get("cpu_count")
-        else:
-            max_workers = os.cpu_count()
-
         # cmds is eather list, tuple or generator
         if type(cmds) is list or type(cmds) is tuple:
             total_cmds = len(cmds)
@@ -526,54 +614,85 @@ class Extension(metaclass=abc.ABCMeta):
 
     @staticmethod
     def _import_extension_modules():
-        clade_modules = [x for x in sys.modules if x.startswith("clade")]
-
         """Import all Python modules located in 'extensions' folder."""
-        for _, _, filenames in os.walk(os.path.dirname(__file__)):
-            for filename in fnmatch.filter(filenames, "*.py"):
-                module_name = "." + os.path.splitext(os.path.basename(filename))[0]
+        global _MODULES_IMPORTED
 
-                for module in clade_modules:
-                    if module.endswith(module_name):
-                        break
-                else:
-                    importlib.import_module(module_name, "clade.extensions")
+        if _MODULES_IMPORTED:
+            return
+
+        with os.scandir(os.path.dirname(__file__)) as it:
+            module_names = [
+                "." + entry.name[:-3]
+                for entry in it
+                if entry.name.endswith(".py") and entry.name != "__init__.py" and entry.is_file()
+            ]
+
+        for module_name in module_names:
+            # Already imported modules are taken from sys.modules
+            importlib.import_module(module_name, "clade.extensions")
+
+        # Newly imported extensions must be visible to find_subclass()
+        Extension._get_subclasses_by_name.cache_clear()
+
+        _MODULES_IMPORTED = True
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_subclasses_by_name():
+        """Get "Name -> Class" mapping of all subclasses of Extension class."""
+        subclasses = dict()
+
+        for ext_class in Extension.__get_all_subclasses(Extension):
+            subclasses.setdefault(ext_class.__name__, ext_class)
+
+        return subclasses
 
     @staticmethod
     def find_subclass(ext_name):
         """Find a subclass of Interface class."""
-        for ext_class in Extension.__get_all_subclasses(Extension):
-            if ext_name == ext_class.__name__:
-                return ext_class
-        else:
+        try:
+            return Extension._get_subclasses_by_name()[ext_name]
+        except KeyError:
             raise NotImplementedError("Can't find '{}' class".format(ext_name))
 
-    def log(self, message):
-        """Print debug message.
+    def log(self, message, *args):
+        """Print info message.
 
         self.conf["log_level"] must be set to INFO or DEBUG in order to see the message.
         """
-        logger.info("{}: {}".format(self.name, message))
+        self.__log(logging.INFO, message, args)
 
-    def debug(self, message):
+    def debug(self, message, *args):
         """Print debug message.
 
         self.conf["log_level"] must be set to DEBUG in order to see the message.
+        Pass values as args instead of formatting the message beforehand:
+        then it will be formatted only if it is actually printed.
 
         WARNING: debug messages can have a great impact on the performance.
         """
-        logger.debug("{}: {}".format(self.name, message))
+        self.__log(logging.DEBUG, message, args)
 
-    def warning(self, message):
+    def warning(self, message, *args):
         """Print warning message.
 
         self.conf["log_level"] must be set to WARNING, INFO or DEBUG in order to see the message.
         """
-        logger.warning("{}: {}".format(self.name, message))
+        self.__log(logging.WARNING, message, args)
 
-    def error(self, message):
+    def error(self, message, *args):
         """Print error message.
 
         self.conf["log_level"] must be set to ERROR, WARNING, INFO or DEBUG in order to see the message.
         """
-        logger.error("{}: {}".format(self.name, message))
+        self.__log(logging.ERROR, message, args)
+
+    def __log(self, level, message, args):
+        # Message is formatted with str.format() only if it will be printed
+        if not logger.isEnabledFor(level):
+            return
+
+        if args:
+            message = message.format(*args)
+
+        logger.log(level, "%s: %s", self.name, message)
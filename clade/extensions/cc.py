@@ -13,13 +13,57 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import mmap
 import os
+import re
 import shlex
 import subprocess
 
+from clade.extensions.abstract import logger
 from clade.extensions.compiler import Compiler
 from clade.extensions.opts import cc_preprocessor_opts
 
+# Dependency is a sequence of non-whitespace characters,
+# where whitespaces and other characters can be escaped with a backslash
+_DEP_RE = re.compile(rb"(?:\\.|[^\s\\])+")
+_DEP_ESCAPE_RE = re.compile(r"\\(.)")
+
+# Files with these extensions are passed by the compiler directly to the linker,
+# so running it with -M on them never produces any dependencies
+_LINKER_INPUT_EXTENSIONS = frozenset([".o", ".obj", ".lo", ".a", ".so", ".la"])
+
+
+def _unescape_dep(dep):
+    if "\\" not in dep:
+        return dep
+
+    return _DEP_ESCAPE_RE.sub(r"\1", dep)
+
+
+def _is_target(token):
+    # Targets of the rules end with a non-escaped colon
+    return token.endswith(b":") and not token.endswith(b"\\:")
+
+
+def _iter_rule_deps(tokens):
+    """Yield prerequisites of the first rule from the tokenized dependency file.
+
+    All next rules are skipped: these are empty rules for each header file
+    that are generated if -MP option is used.
+    """
+    tokens = iter(tokens)
+
+    for token in tokens:
+        if _is_target(token):
+            break
+
+    for token in tokens:
+        if _is_target(token):
+            break
+
+        yield token
+
 
 class CC(Compiler):
     """Class for parsing CC build commands."""
@@ -50,13 +94,13 @@ class CC(Compiler):
             self.dump_bad_cmd_by_id(cmd_id, parsed_cmd)
             return
 
-        self.debug("Parsed command: {}".format(parsed_cmd))
+        self.debug("Parsed command: {}", parsed_cmd)
 
         if self.conf.get(
             "Compiler.preprocess_cmds"
         ) and self.is_a_compilation_command(parsed_cmd):
             pre = self.__preprocess_cmd(parsed_cmd)
-            self.debug("Preprocessed files: {}".format(pre))
+            self.debug("Preprocessed files: {}", pre)
             self.store_pre_files(pre, parsed_cmd["cwd"])
 
             for file in pre:
@@ -64,7 +108,7 @@ class CC(Compiler):
                     os.remove(file)
 
         deps = self.__get_deps(cmd_id, parsed_cmd)
-        self.debug("Dependencies: {}".format(deps))
+        self.debug("Dependencies: {}", deps)
         self.dump_deps_by_id(cmd_id, deps)
         self.dump_cmd_by_id(cmd_id, parsed_cmd)
 
@@ -75,17 +119,24 @@ class CC(Compiler):
 
     def __get_deps(self, cmd_id, cmd):
         """Get a list of CC command dependencies."""
-        deps = []
+        # Do not execute a command that does not contain any input files
+        if not cmd["in"] or "-" in cmd["in"]:
+            self.debug("Command does not contain any input files, skipping")
+            return []
+
+        # Dictionary is used as an ordered set to remove duplicates
+        deps = dict()
 
         for cmd_in in cmd["in"]:
-            self.debug("Collecting dependencies for {!r} file".format(cmd_in))
-            deps_file = self.__collect_deps(cmd_id, cmd, cmd_in)
+            if os.path.splitext(cmd_in)[1] in _LINKER_INPUT_EXTENSIONS:
+                self.debug("Skipping linker input file {!r}", cmd_in)
+                continue
 
-            # Remove duplicates
-            for dep in [d for d in self.__parse_deps(deps_file) if d not in deps]:
-                deps.append(dep)
+            self.debug("Collecting dependencies for {!r} file", cmd_in)
+            deps_file = self.__collect_deps(cmd_id, cmd, cmd_in)
+            deps.update(dict.fromkeys(self.__parse_deps(deps_file)))
 
-        return deps
+        return list(deps)
 
     def __collect_deps(self, cmd_id, cmd, cmd_in):
         deps_file = os.path.join(self.temp_dir, "{}-deps.txt".format(cmd_id))
@@ -98,47 +149,41 @@ class CC(Compiler):
         opts = cmd["opts"] + additional_opts
         command = [cmd["command"][0]] + opts + [cmd_in]
 
-        # Do not execute a command that does not contain any input files
-        if cmd["in"] and "-" not in cmd["in"]:
-            self.debug("CWD: {!r}".format(cmd["cwd"]))
-            self.debug("Executing command: {!r}".format(
-                " ".join([shlex.quote(x) for x in command]))
-            )
-            subprocess.call(
-                command,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                cwd=cmd["cwd"],
-            )
-        else:
-            self.debug("Command does not contain any input files, skipping")
+        self.debug("CWD: {!r}", cmd["cwd"])
+        if logger.isEnabledFor(logging.DEBUG):
+            self.debug("Executing command: {!r}", " ".join([shlex.quote(x) for x in command]))
+        subprocess.call(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=cmd["cwd"],
+        )
 
         return deps_file
 
     def __parse_deps(self, deps_file):
-        deps = []
-
-        if os.path.isfile(deps_file):
-            self.debug("Parsing dependencies file {!r}".format(deps_file))
-            with open(deps_file, encoding="utf8") as fp:
-                for line in fp.readlines():
-                    self.debug("Line: {!r}".format(line))
-                    line = line.lstrip(" ")
-                    line = line.rstrip(" \\\n")
-                    line = line.rstrip(":")
-
-                    if not line:
-                        continue
-
-                    # Split with non-escaped space
-                    deps.extend(shlex.split(line))
-
-            os.remove(deps_file)
-        else:
+        if not os.path.isfile(deps_file):
             self.debug("File with dependencies does not exist")
+            return []
+
+        self.debug("Parsing dependencies file {!r}", deps_file)
+        with open(deps_file, "rb") as fp:
+            # Empty files can't be mapped into memory
+            if os.fstat(fp.fileno()).st_size:
+                # Scan file contents in place, without reading it into a buffer.
+                # Split with non-escaped whitespaces, skipping line continuations.
+                # Ignore targets (output files, .o)
+                with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    deps = [
+                        _unescape_dep(dep.decode("utf8"))
+                        for dep in _iter_rule_deps(_DEP_RE.findall(mm))
+                    ]
+            else:
+                deps = []
 
-        # Ignore first element (output file, .o)
-        return deps[1:]
+        os.remove(deps_file)
+
+        return deps
 
     def is_bad(self, cmd):
         if super().is_bad(cmd):
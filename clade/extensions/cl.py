@@ -39,18 +39,19 @@ class CL(Compiler):
         super().parse(cmds_file, self.conf.get("CL.which_list", []))
 
     def parse_cmd(self, cmd):
-        self.debug("Parse: {}".format(cmd))
+        self.debug("Parse: {}", cmd)
         parsed_cmd = self.__parse_opts(cmd)
 
         if self.is_bad(parsed_cmd):
             self.dump_bad_cmd_by_id(cmd["id"], parsed_cmd)
             return
 
-        deps = set(self.__get_deps(cmd["id"], parsed_cmd) + parsed_cmd["in"])
-        self.debug("Dependencies: {}".format(deps))
+        deps = self.__get_deps(cmd["id"], parsed_cmd)
+        deps.update(parsed_cmd["in"])
+        self.debug("Dependencies: {}", deps)
         self.dump_deps_by_id(cmd["id"], deps)
 
-        self.debug("Parsed command: {}".format(parsed_cmd))
+        self.debug("Parsed command: {}", parsed_cmd)
         self.dump_cmd_by_id(cmd["id"], parsed_cmd)
 
         if self.conf.get(
@@ -154,11 +155,11 @@ class CL(Compiler):
         return parsed_cmd
 
     def __get_deps(self, cmd_id, cmd):
-        """Get a list of CL command dependencies."""
-        deps = []
+        """Get a set of CL command dependencies."""
+        deps = set()
         for cmd_in in cmd["in"]:
             deps_file = self.__collect_deps(cmd_id, cmd, cmd_in)
-            deps.extend(self.__parse_deps(deps_file))
+            deps.update(self.__parse_deps(deps_file))
 
         return deps
 
@@ -248,7 +249,7 @@ class CL(Compiler):
         self.__normalize_paths(pre_to, cmd["cwd"], encoding)
 
         if self.conf.get("Compiler.preprocess_cmds"):
-            self.debug("Preprocessed file: {}".format(pre_to))
+            self.debug("Preprocessed file: {}", pre_to)
             self.store_pre_files([pre_to], cmd["cwd"], encoding)
 
         os.remove(pre_to)
@@ -94,9 +94,14 @@ class CmdGraph(Extension):
             self.extensions["Path"].normalize_rel_paths(cmd["in"], cmd["cwd"])
             self.extensions["Path"].normalize_rel_paths(cmd["out"], cmd["cwd"])
 
-            if hasattr(self.extensions[cmd["type"]], "load_deps_by_id"):
-                for src_file in self.extensions[cmd["type"]].load_deps_by_id(cmd["id"]):
-                    self.extensions["Path"].normalize_rel_path(src_file, cmd["cwd"])
+        # Process commands in the order in which their dependencies are stored,
+        # so each bucket with dependencies is loaded only once
+        deps_cmds = [cmd for cmd in cmds if hasattr(self.extensions[cmd["type"]], "load_deps_by_id")]
+        deps_cmds.sort(key=lambda cmd: (cmd["type"], self.extensions[cmd["type"]].get_deps_bucket(cmd["id"])))
+
+        for cmd in deps_cmds:
+            for src_file in self.extensions[cmd["type"]].load_deps_by_id(cmd["id"]):
+                self.extensions["Path"].normalize_rel_path(src_file, cmd["cwd"])
 
     @Extension.prepare
     def parse(self, cmds_file):
@@ -74,7 +74,7 @@ class Common(Extension, metaclass=abc.ABCMeta):
         cmds = iter_cmds_by_which(cmds_file, which_list)
         self.parse_cmds_in_parallel(cmds, unwrap, total_cmds=total_cmds)
 
-        self.__merge_all_cmds()
+        self.merge_parsed_data()
 
         if os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
@@ -100,7 +100,7 @@ class Common(Extension, metaclass=abc.ABCMeta):
 
     def parse_cmd(self, cmd, cmd_type):
         """Parse single build command."""
-        self.debug("Parse: {}".format(cmd))
+        self.debug("Parse: {}", cmd)
         parsed_cmd = self._get_cmd_dict(cmd)
 
         if cmd_type not in requires_value:
@@ -121,7 +121,7 @@ class Common(Extension, metaclass=abc.ABCMeta):
                     parsed_cmd["opts"].extend([opt, val])
             # Options without values
             # Or with values that are not separated by space
-            elif re.search(r"^-", opt):
+            elif opt.startswith("-"):
                 parsed_cmd["opts"].append(opt)
             # Input files are not options and not values of other options
             else:
@@ -180,6 +180,10 @@ class Common(Extension, metaclass=abc.ABCMeta):
             for cmd_json in cmd_jsons
         ]
 
+    def merge_parsed_data(self):
+        """Merge data that was dumped separately for each parsed command."""
+        self.__merge_all_cmds()
+
     def __merge_all_cmds(self):
         """Merge all parsed commands into a single json file."""
         cmd_jsons = glob.glob(
@@ -13,10 +13,50 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import glob
 import os
+import ujson
 
 from clade.extensions.common import Common
 
+# Temporary files with dependencies that are opened by the current process.
+# Files are kept open between commands to avoid reopening them each time,
+# but only a few at once, since commands are usually parsed in order of their IDs
+_deps_fds = collections.OrderedDict()
+_MAX_OPEN_DEPS_FILES = 8
+
+
+def _append_to_deps_file(deps_file, data):
+    fd = _deps_fds.get(deps_file)
+
+    if fd is None:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+
+        try:
+            fd = os.open(deps_file, flags, 0o666)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(deps_file), exist_ok=True)
+            fd = os.open(deps_file, flags, 0o666)
+
+        _deps_fds[deps_file] = fd
+
+        if len(_deps_fds) > _MAX_OPEN_DEPS_FILES:
+            os.close(_deps_fds.popitem(last=False)[1])
+    else:
+        _deps_fds.move_to_end(deps_file)
+
+    # Data is written without buffering, so nothing is lost
+    # if worker process exits without closing its files
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _close_deps_files(deps_dir):
+    for deps_file in [x for x in _deps_fds if x.startswith(deps_dir + os.sep)]:
+        os.close(_deps_fds.pop(deps_file))
+
 
 class Compiler(Common):
     """Parent class for all C compiler classes."""
@@ -25,7 +65,20 @@ class Compiler(Common):
 
     file_extensions = [".c", ".i"]
 
-    __version__ = "1"
+    # Dependencies of this number of commands with consecutive IDs
+    # are stored in a single json file
+    deps_bucket_size = 256
+    # Maximum number of buckets with dependencies that are kept in memory
+    deps_cache_size = 16
+
+    __version__ = "3"
+
+    def __init__(self, work_dir, conf=None):
+        super().__init__(work_dir, conf)
+
+        self.deps_dir = "deps"
+        # LRU cache of already loaded buckets with dependencies
+        self.__deps_cache = collections.OrderedDict()
 
     def store_deps_files(self, deps, cwd):
         self.__store_src_files(deps, cwd, self.conf.get("Compiler.deps_encoding"))
@@ -33,18 +86,86 @@ class Compiler(Common):
     def store_pre_files(self, deps, cwd, encoding=None):
         self.__store_src_files(deps, cwd, encoding)
 
-    def __store_src_files(self, deps, cwd, encodng=None):
-        for file in deps:
-            if not os.path.isabs(file):
-                file = os.path.join(cwd, file)
-
-            self.extensions["Storage"].add_file(file, encoding=None)
+    def __store_src_files(self, deps, cwd, encoding=None):
+        files = [file if os.path.isabs(file) else os.path.join(cwd, file) for file in deps]
+        self.extensions["Storage"].add_files(files, encoding=encoding)
 
     def load_deps_by_id(self, id):
-        return self.load_data(os.path.join("deps", "{}.json".format(id)))
+        return self.__get_deps_from_bucket(id, self.__load_deps_bucket(self.get_deps_bucket(id)))
+
+    def __get_deps_from_bucket(self, id, deps):
+        if str(id) not in deps:
+            self.error("Dependencies of the command with ID={!r} are not found".format(id))
+            raise FileNotFoundError
+
+        return list(deps[str(id)])
 
     def dump_deps_by_id(self, id, deps):
-        self.dump_data(deps, os.path.join("deps", "{}.json".format(id)))
+        # Dependencies are appended to the temporary file of the corresponding bucket
+        # (separate for each worker process) until they are merged by merge_parsed_data()
+        deps_file = os.path.join(
+            self.temp_dir,
+            self.deps_dir,
+            "{}-{}.txt".format(self.get_deps_bucket(id), os.getpid()),
+        )
+        line = ujson.dumps(
+            [str(id), list(deps)], ensure_ascii=False, escape_forward_slashes=False
+        ) + "\n"
+
+        _append_to_deps_file(deps_file, line.encode("utf8"))
+
+    def merge_parsed_data(self):
+        super().merge_parsed_data()
+        self.__merge_all_deps()
+
+    def __merge_all_deps(self):
+        """Merge dependencies of all commands into several bigger json files."""
+        deps_files = collections.defaultdict(list)
+
+        # Files could be opened by this process if commands were parsed without workers
+        _close_deps_files(os.path.join(self.temp_dir, self.deps_dir))
+
+        for deps_file in glob.glob(os.path.join(self.temp_dir, self.deps_dir, "*.txt")):
+            bucket = os.path.basename(deps_file).split("-")[0]
+            deps_files[bucket].append(deps_file)
+
+        # Merge one bucket at a time to keep memory usage low
+        for bucket in deps_files:
+            deps = dict()
+
+            for deps_file in deps_files[bucket]:
+                with open(deps_file, encoding="utf8") as fh:
+                    for line in fh:
+                        id, cmd_deps = ujson.loads(line)
+                        deps[id] = cmd_deps
+
+            self.dump_data(deps, os.path.join(self.deps_dir, "{}.json".format(bucket)))
+
+        self.__deps_cache.clear()
+
+    def get_deps_bucket(self, id):
+        """Get number of the bucket where dependencies of the command are stored.
+
+        Commands that are sorted by this number can be processed
+        using a small number of loaded buckets.
+        """
+        return int(id) // self.deps_bucket_size
+
+    def __read_deps_bucket(self, bucket):
+        return self.load_data(
+            os.path.join(self.deps_dir, "{}.json".format(bucket)), raise_exception=False
+        )
+
+    def __load_deps_bucket(self, bucket):
+        if bucket in self.__deps_cache:
+            self.__deps_cache.move_to_end(bucket)
+        else:
+            self.__deps_cache[bucket] = self.__read_deps_bucket(bucket)
+
+            if len(self.__deps_cache) > self.deps_cache_size:
+                self.__deps_cache.popitem(last=False)
+
+        return self.__deps_cache[bucket]
 
     def is_a_compilation_command(self, cmd):
         if any(
@@ -61,6 +182,11 @@ class Compiler(Common):
     def load_all_cmds(self, filter_by_pid=True, with_opts=False, with_raw=False, with_deps=False, compile_only=False):
         cmds = super().load_all_cmds(with_opts=with_opts, with_raw=with_raw, filter_by_pid=filter_by_pid)
 
+        # Commands are yielded in arbitrary order, so each bucket with
+        # dependencies is loaded once and kept in memory only until all
+        # commands are processed
+        deps_buckets = dict()
+
         # compile only - ignore linker commands, like gcc func.o main.o -o main
         # or cl /EP /P file.c
         for cmd in cmds:
@@ -74,7 +200,12 @@ class Compiler(Common):
                     continue
 
             if with_deps:
-                cmd["deps"] = self.load_deps_by_id(cmd["id"])
+                bucket = self.get_deps_bucket(cmd["id"])
+
+                if bucket not in deps_buckets:
+                    deps_buckets[bucket] = self.__read_deps_bucket(bucket)
+
+                cmd["deps"] = self.__get_deps_from_bucket(cmd["id"], deps_buckets[bucket])
 
             yield cmd
 
@@ -29,6 +29,16 @@ import time
 from clade.extensions.abstract import Extension
 from clade.extensions.opts import filter_opts
 
+# Regular expressions for parsing CIF output, which can contain millions of lines
+_DEFINITION_RE = re.compile(r"\"(.*?)\" (\S*) (\S*) (\S*) ([^']*)\n")
+_DECLARATION_RE = re.compile(r"\"(.*?)\" (\S*) (\S*) (\S*) ([^']*)\n")
+_EXPORTED_RE = re.compile(r"\"(.*?)\" (\S*)")
+_CALL_RE = re.compile(r'\"(.*?)\" (\S*) (\S*) (\S*) (\S*) (.*)')
+_CALL_ARGS_RE = re.compile(r"actual_arg_func_name(\d+)=\s*(\w+)\s*")
+_CALLP_RE = re.compile(r'\"(.*?)\" (\S*) (\S*) (\S*)')
+_USE_FUNC_RE = re.compile(r'\"(.*?)\" (\S*) (\S*) (\S*)')
+_TYPEDEF_RE = re.compile(r'\"(.*?)\" typedef (.*)')
+
 
 class Info(Extension):
     always_requires = ["SrcGraph", "Path", "Storage"]
@@ -358,105 +368,108 @@ class Info(Extension):
     def iter_definitions(self):
         """Yield src_file, func, def_line, func_type, signature"""
 
-        regex = re.compile(r"\"(.*?)\" (\S*) (\S*) (\S*) ([^']*)\n")
-
-        for content in self.__iter_file_regex(self.execution, regex):
+        for content in self.__iter_file_regex(self.execution, _DEFINITION_RE):
             yield content
 
     def iter_declarations(self):
         """Yield decl_file, decl_name, decl_line, decl_type, decl_signature"""
 
-        regex = re.compile(r"\"(.*?)\" (\S*) (\S*) (\S*) ([^']*)\n")
-
-        for content in self.__iter_file_regex(self.decl, regex):
+        for content in self.__iter_file_regex(self.decl, _DECLARATION_RE):
             yield content
 
     def iter_exported(self):
         """Yield src_file, func"""
 
-        regex = re.compile(r"\"(.*?)\" (\S*)")
-
-        for content in self.__iter_file_regex(self.exported, regex):
+        for content in self.__iter_file_regex(self.exported, _EXPORTED_RE):
             yield content
 
     def iter_calls(self):
         """Yield context_file, context_func, func, call_line, call_type, args"""
 
-        regex = re.compile(r'\"(.*?)\" (\S*) (\S*) (\S*) (\S*) (.*)')
-        args_regex = re.compile(r"actual_arg_func_name(\d+)=\s*(\w+)\s*")
+        findall_args = _CALL_ARGS_RE.findall
 
-        for content in self.__iter_file_regex(self.call, regex):
+        for content in self.__iter_file_regex(self.call, _CALL_RE):
             content = list(content)
 
             # Last element should be args
-            content[-1] = args_regex.findall(content[-1])
+            content[-1] = findall_args(content[-1])
 
             yield content
 
     def iter_calls_by_pointers(self):
         """Yield context_file, context_func, func_ptr, call_line"""
 
-        regex = re.compile(r'\"(.*?)\" (\S*) (\S*) (\S*)')
-
-        for content in self.__iter_file_regex(self.callp, regex):
+        for content in self.__iter_file_regex(self.callp, _CALLP_RE):
             yield content
 
     def iter_functions_usages(self):
         """Yield context_file, context_func, func, line"""
 
-        regex = re.compile(r'\"(.*?)\" (\S*) (\S*) (\S*)')
-
-        for content in self.__iter_file_regex(self.use_func, regex):
+        for content in self.__iter_file_regex(self.use_func, _USE_FUNC_RE):
             yield content
 
     def iter_macros_definitions(self):
         """Yield file, macro, line"""
 
-        regex = re.compile(r"\"(.*?)\" (\S*) (\S*)")
+        # Lines have fixed format, so splitting them is faster than regex matching:
+        # "file" macro line
+        for line in self.__iter_file(self.define):
+            file, sep, rest = line[1:].partition('" ')
 
-        for content in self.__iter_file_regex(self.define, regex):
-            yield content
+            if not line.startswith('"') or not sep:
+                self.__unexpected_format(line)
+
+            macro, _, def_line = rest.rstrip("\n").partition(" ")
+
+            yield file, macro, def_line
 
     def iter_macros_expansions(self):
         """Yield exp_file, def_file, macro, exp_line, def_line, args_str"""
 
-        regex = re.compile(r'\"(.*?)\" \"(.*?)\" (\S*) (\S*) (\S*)(.*)')
-        arg_regex = re.compile(r' actual_arg\d+=(.*)')
+        # "exp_file" "def_file" macro exp_line def_line[ actual_arg1=val1, ...]
+        for line in self.__iter_file(self.expand):
+            exp_file, sep1, rest = line[1:].partition('" "')
+            def_file, sep2, rest = rest.partition('" ')
 
-        for content in self.__iter_file_regex(self.expand, regex):
-            content = list(content)
+            if not line.startswith('"') or not sep1 or not sep2:
+                self.__unexpected_format(line)
 
-            args = list()
+            try:
+                macro, exp_line, rest = rest.rstrip("\n").split(" ", 2)
+            except ValueError:
+                self.__unexpected_format(line)
 
-            # Last element should be args
-            if content[-1]:
-                for arg in content[-1].split(','):
-                    m_arg = arg_regex.match(arg)
-                    if m_arg:
-                        args.append(m_arg.group(1))
+            def_line, _, args_str = rest.partition(" ")
 
-            content[-1] = args
+            args = [
+                arg.partition("=")[2]
+                for arg in args_str.split(",")
+                if arg.lstrip(" ").startswith("actual_arg")
+            ]
 
-            yield content
+            yield [exp_file, def_file, macro, exp_line, def_line, args]
 
     def iter_typedefs(self):
         """Yeild scope_file, declaration"""
 
-        regex = re.compile(r'\"(.*?)\" typedef (.*)')
-
-        for content in self.__iter_file_regex(self.typedefs, regex):
+        for content in self.__iter_file_regex(self.typedefs, _TYPEDEF_RE):
             yield content
 
     def __iter_file_regex(self, file, regex):
+        match = regex.match
+
         for line in self.__iter_file(file):
-            m = regex.match(line)
+            m = match(line)
 
             if not m:
-                self.error("CIF output has unexpected format: {!r}".format(line))
-                raise SyntaxError
+                self.__unexpected_format(line)
 
             yield m.groups()
 
+    def __unexpected_format(self, line):
+        self.error("CIF output has unexpected format: {!r}".format(line))
+        raise SyntaxError
+
     def __iter_file(self, file):
         if not os.path.isfile(file):
             return []
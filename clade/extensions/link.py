@@ -30,7 +30,7 @@ class Link(Common):
         super().parse(cmds_file, self.conf.get("Link.which_list", []))
 
     def parse_cmd(self, cmd):
-        self.debug("Parse: {}".format(cmd))
+        self.debug("Parse: {}", cmd)
         parsed_cmd = self._get_cmd_dict(cmd)
 
         if self.name not in requires_value:
@@ -69,5 +69,5 @@ class Link(Common):
             self.dump_bad_cmd_by_id(cmd["id"], parsed_cmd)
             return
 
-        self.debug("Parsed command: {}".format(parsed_cmd))
+        self.debug("Parsed command: {}", parsed_cmd)
         self.dump_cmd_by_id(cmd["id"], parsed_cmd)
@@ -61,12 +61,14 @@ class Macros(Extension):
             if def_file not in self.macros:
                 def_file = "unknown"
 
+            exps = self.macros[def_file][macro][def_line][exp_file]
+
             if not args:
-                self.macros[def_file][macro][def_line][exp_file][exp_line] = []
-            elif self.macros[def_file][macro][def_line][exp_file][exp_line]:
-                self.macros[def_file][macro][def_line][exp_file][exp_line].append(args)
+                exps[exp_line] = []
+            elif exps.get(exp_line):
+                exps[exp_line].append(args)
             else:
-                self.macros[def_file][macro][def_line][exp_file][exp_line] = [args]
+                exps[exp_line] = [args]
 
     def __reverse_expansions(self):
         for def_file, macros in self.yield_macros():
@@ -49,5 +49,5 @@ class MV(Common):
             self.dump_bad_cmd_by_id(cmd["id"], parsed_cmd)
             return
 
-        self.debug("Parsed command: {}".format(parsed_cmd))
+        self.debug("Parsed command: {}", parsed_cmd)
         self.dump_cmd_by_id(cmd["id"], parsed_cmd)
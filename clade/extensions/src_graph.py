@@ -88,13 +88,18 @@ class SrcGraph(Extension):
 
         return cmds
 
+    def __deps_order(self, cmd):
+        return cmd["type"], self.extensions[cmd["type"]].get_deps_bucket(cmd["id"])
+
     def __generate_src_graph(self, cmds):
         try:
             cmd_graph = self.extensions["CmdGraph"].load_cmd_graph()
         except FileNotFoundError:
             return
 
-        for cmd in cmds:
+        # Process commands in the order in which their dependencies are stored,
+        # so each bucket with dependencies is loaded only once
+        for cmd in sorted(cmds, key=self.__deps_order):
             cmd_id = str(cmd["id"])
             cmd_type = cmd["type"]
 
@@ -60,6 +60,19 @@ class Storage(Extension):
         except shutil.SameFileError:
             pass
 
+    def add_files(self, filenames, encoding=None):
+        """Add several files to the storage.
+
+        Args:
+            filenames: An iterable of paths to the files
+            encoding: encoding of the files (see 'add_file' method)
+        """
+
+        add_file = self.add_file
+
+        for filename in filenames:
+            add_file(filename, encoding=encoding)
+
     @functools.lru_cache(maxsize=30000)
     def __path_exists(self, path):
         return os.path.exists(path)
@@ -90,11 +103,21 @@ class Storage(Extension):
                 shutil.copyfile(filename, dst)
                 return
 
+            try:
+                # Encode file content to utf-8
+                content_bytes = content_bytes.decode(encoding).encode("utf-8")
+            except (UnicodeDecodeError, LookupError):
+                self.warning(
+                    "Can't decode {!r} using {!r} encoding.".format(
+                        filename, encoding
+                    )
+                )
+                shutil.copyfile(filename, dst)
+                return
+
             with tempfile.NamedTemporaryFile(
                 mode="wb", delete=False
             ) as f:
-                # Encode file content to utf-8
-                content_bytes = content_bytes.decode(encoding).encode("utf-8")
                 # Convert CRLF line endings to LF
                 content_bytes = content_bytes.replace(b"\r\n", b"\n")
                 f.write(content_bytes)
@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
 from clade.extensions.abstract import Extension
 
 
@@ -38,11 +40,14 @@ class Typedefs(Extension):
         self.log("Parsing finished")
 
     def __process_typedefs(self):
+        # Sets are used for fast checking of duplicates,
+        # lists preserve the original order of typedefs
+        seen = collections.defaultdict(set)
+
         for scope_file, declaration in self.extensions["Info"].iter_typedefs():
-            if scope_file not in self.typedefs:
-                self.typedefs[scope_file] = [declaration]
-            elif declaration not in self.typedefs[scope_file]:
-                self.typedefs[scope_file].append(declaration)
+            if declaration not in seen[scope_file]:
+                seen[scope_file].add(declaration)
+                self.typedefs.setdefault(scope_file, []).append(declaration)
 
     def load_typedefs(self, files=None):
         return self.load_data_by_key(self.typedefs_folder, files)
@@ -64,7 +64,7 @@ class Variables(Callgraph):
 
         os.makedirs(os.path.dirname(file_name), exist_ok=True)
 
-        self.debug("Dump {}".format(file_name))
+        self.debug("Dump {}", file_name)
 
         try:
             with open(file_name, "w") as fh:
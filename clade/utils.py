@@ -25,14 +25,18 @@ def get_logger(name, with_name=True, conf=None):
 
     logger = logging.getLogger(name)
 
-    handler = logging.StreamHandler(stream=sys.stdout)
+    # Logger objects are global, so handler must be added only once,
+    # otherwise each message will be printed multiple times
+    if not logger.handlers:
+        handler = logging.StreamHandler(stream=sys.stdout)
 
-    if with_name:
-        handler.setFormatter(logging.Formatter("%(asctime)s clade {}: %(message)s".format(name), "%H:%M:%S"))
-    else:
-        handler.setFormatter(logging.Formatter("%(asctime)s clade: %(message)s", "%H:%M:%S"))
+        if with_name:
+            handler.setFormatter(logging.Formatter("%(asctime)s clade {}: %(message)s".format(name), "%H:%M:%S"))
+        else:
+            handler.setFormatter(logging.Formatter("%(asctime)s clade: %(message)s", "%H:%M:%S"))
+
+        logger.addHandler(handler)
 
-    logger.addHandler(handler)
     logger.setLevel(conf.get("log_level", "INFO"))
 
     return logger
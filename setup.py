@@ -13,7 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import glob
+import hashlib
 import os
 import setuptools
 import shutil
@@ -21,6 +23,11 @@ import subprocess
 import sys
 import tempfile
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 from distutils.command.build import build
 from setuptools.command.develop import develop
 
@@ -32,34 +39,50 @@ LIB = os.path.join(LIBINT_SRC, "lib")
 LIB64 = os.path.join(LIBINT_SRC, "lib64")
 
 
+def run_cmake(args, build_dir, env=None):
+    subprocess.run(
+        ["cmake"] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        cwd=build_dir,
+        env=env,
+        universal_newlines=True,
+        check=True,
+    )
+
+
 def build_target(target, build_dir, src_dir, options=None, quiet=False):
     if not options:
         options = []
 
     os.makedirs(build_dir, exist_ok=True)
 
+    # Compile sources in parallel (supported by cmake 3.12 and newer)
+    env = dict(os.environ)
+    env.setdefault("CMAKE_BUILD_PARALLEL_LEVEL", str(os.cpu_count() or 2))
+
     try:
-        subprocess.check_output(
-            ["cmake", src_dir] + options,
-            stderr=subprocess.STDOUT,
-            cwd=build_dir,
-            universal_newlines=True,
-        )
-        subprocess.check_output(
-            [
-                "cmake",
-                "--build",
-                ".",
-                "--target",
-                target,
-                "--config",
-                "Release",
-            ],
-            stderr=subprocess.STDOUT,
-            cwd=build_dir,
-            universal_newlines=True,
+        # Build directory is reused between builds, so configuration step
+        # is fast if nothing has changed
+        try:
+            run_cmake([src_dir] + options, build_dir)
+        except subprocess.CalledProcessError:
+            # Existing cache may be stale (for example, created by
+            # a different version of cmake), so configuration is repeated
+            # in the clean build directory
+            shutil.rmtree(build_dir)
+            os.makedirs(build_dir)
+            run_cmake([src_dir] + options, build_dir)
+
+        run_cmake(
+            ["--build", ".", "--target", target, "--config", "Release"],
+            build_dir,
+            env=env,
         )
     except subprocess.CalledProcessError as e:
+        # Failed configuration must not be reused by the next build
+        shutil.rmtree(build_dir, ignore_errors=True)
+
         if not quiet:
             print(e.output)
         raise RuntimeError(
@@ -115,25 +138,81 @@ def build_debugger(build_dir):
     shutil.copy(copy_from, LIBINT_SRC)
 
 
-def build_libinterceptor():
+def get_build_dir():
+    """Get persistent build directory, so incremental builds are possible.
+
+    Returns None if such directory can't be created.
+    """
+    cache_dir = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    key = hashlib.sha1(LIBINT_SRC.encode("utf-8")).hexdigest()
+    build_dir = os.path.join(cache_dir, "clade", "build-{}".format(key))
+
+    try:
+        os.makedirs(build_dir, exist_ok=True)
+    except OSError:
+        return None
+
+    if not os.access(build_dir, os.W_OK):
+        return None
+
+    return build_dir
+
+
+@contextlib.contextmanager
+def lock_build_dir(build_dir):
+    """Prevent concurrent builds in the same build directory."""
+    if not fcntl:
+        yield
+        return
+
+    with open(build_dir + ".lock", "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def build_all(build_dir):
+    if sys.platform == "linux":
+        build_wrapper(build_dir)
+        build_interceptor(build_dir)
+        build_multilib(build_dir)
+    elif sys.platform == "darwin":
+        build_wrapper(build_dir)
+        build_interceptor(build_dir)
+    elif sys.platform == "win32":
+        build_debugger(build_dir)
+    else:
+        exit(
+            "Your platform {!r} is not supported yet.".format(sys.platform)
+        )
+
+
+def build_libinterceptor(persistent=False):
+    """Build libinterceptor and wrappers.
+
+    Persistent build directory is used only if sources are located
+    in a stable place (develop mode), since pip builds packages
+    in a new temporary directory each time.
+    """
+    build_dir = get_build_dir() if persistent else None
+
+    if build_dir:
+        with lock_build_dir(build_dir):
+            build_all(build_dir)
+        return
+
     build_dir = tempfile.mkdtemp()
 
     try:
-        if sys.platform == "linux":
-            build_wrapper(build_dir)
-            build_interceptor(build_dir)
-            build_multilib(build_dir)
-        elif sys.platform == "darwin":
-            build_wrapper(build_dir)
-            build_interceptor(build_dir)
-        elif sys.platform == "win32":
-            build_debugger(build_dir)
-        else:
-            exit(
-                "Your platform {!r} is not supported yet.".format(sys.platform)
-            )
+        build_all(build_dir)
     finally:
-        shutil.rmtree(build_dir)
+        # Directory may be already removed after failed build
+        shutil.rmtree(build_dir, ignore_errors=True)
 
 
 def package_files(package_directory):
@@ -173,7 +252,7 @@ class CustomBuild(build):
 
 class CustomDevelop(develop):
     def run(self):
-        build_libinterceptor()
+        build_libinterceptor(persistent=True)
         super().run()
 
 
@@ -199,7 +278,7 @@ setuptools.setup(
     license="LICENSE.txt",
     description="Clade is a tool for extracting information about software build process and source code",
     long_description=open("README.rst", encoding="utf8").read(),
-    python_requires=">=3.4",
+    python_requires=">=3.6",
     packages=["clade"],
     package_data={"clade": package_files("clade")},
     entry_points={
@@ -217,12 +296,10 @@ setuptools.setup(
         "develop": CustomDevelop,
         "bdist_wheel": bdist_wheel,
     },
-    install_requires=["ujson", "chardet", "cchardet", "graphviz", "ply"],
+    install_requires=["ujson", "orjson", "chardet", "cchardet", "graphviz", "ply"],
     extras_require={"dev": ["pytest", "pytest-profiling"]},
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
         "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
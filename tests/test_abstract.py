@@ -15,6 +15,7 @@
 
 import pytest
 import os
+import sys
 import unittest.mock
 
 from clade import Clade
@@ -24,10 +25,27 @@ def test_cc_parallel(tmpdir, cmds_file):
     del os.environ["CLADE_DEBUG"]
 
     try:
-        c = Clade(tmpdir, cmds_file)
+        c = Clade(tmpdir, cmds_file, conf={"cpu_count": 2})
         e = c.parse("CC")
 
         assert e.load_all_cmds()
+
+        for cmd in e.load_all_cmds(with_deps=True, compile_only=True):
+            assert cmd["deps"]
+    finally:
+        os.environ["CLADE_DEBUG"] = "1"
+
+
+def test_cc_one_cpu(tmpdir, cmds_file):
+    del os.environ["CLADE_DEBUG"]
+
+    try:
+        with unittest.mock.patch("clade.extensions.abstract.ProcessPoolExecutor") as pool_mock:
+            c = Clade(tmpdir, cmds_file, conf={"cpu_count": 1})
+            e = c.parse("CC")
+
+            assert not pool_mock.called
+            assert e.load_all_cmds()
     finally:
         os.environ["CLADE_DEBUG"] = "1"
 
@@ -40,7 +58,7 @@ def test_cc_parallel_with_exception(tmpdir, cmds_file):
         with unittest.mock.patch("concurrent.futures.Future.result") as result_mock:
             result_mock.side_effect = Exception
 
-            c = Clade(tmpdir, cmds_file)
+            c = Clade(tmpdir, cmds_file, conf={"cpu_count": 2})
             with pytest.raises(RuntimeError):
                 c.parse("CC")
     finally:
@@ -54,7 +72,7 @@ def test_cc_parallel_with_print(tmpdir, cmds_file):
         with unittest.mock.patch("sys.stdout.isatty") as isatty_mock:
             isatty_mock.return_value = True
 
-            c = Clade(tmpdir, cmds_file)
+            c = Clade(tmpdir, cmds_file, conf={"cpu_count": 2})
             e = c.parse("CC")
 
             assert e.load_all_cmds()
@@ -116,3 +134,45 @@ def test_check_conf_consistency(tmpdir, cmds_file):
     c = Clade(tmpdir, cmds_file, conf=changed_conf)
     with pytest.raises(RuntimeError):
         c.parse("CC")
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+@pytest.mark.parametrize("pretty", [True, False])
+def test_dump_load_data(tmpdir, with_orjson, pretty):
+    if with_orjson:
+        orjson = pytest.importorskip("orjson")
+    else:
+        orjson = None
+
+    data = {"b": ["/usr/include/stdio.h", "файл.c"], "a": {"1": None}}
+
+    with unittest.mock.patch("clade.extensions.abstract.orjson", orjson):
+        c = Clade(tmpdir, conf={"pretty": pretty})
+        e = c.Storage
+        e.dump_data(data, "data.json")
+
+        with open(os.path.join(e.work_dir, "data.json"), "rb") as fh:
+            assert (b"\n" in fh.read()) == pretty
+
+        assert e.load_data("data.json") == data
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="umask is not supported")
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_dump_data_permissions(tmpdir, with_orjson):
+    if with_orjson:
+        orjson = pytest.importorskip("orjson")
+    else:
+        orjson = None
+
+    old_umask = os.umask(0o002)
+
+    try:
+        with unittest.mock.patch("clade.extensions.abstract.orjson", orjson):
+            e = Clade(tmpdir).Storage
+            e.dump_data({"a": 1}, "data.json")
+
+        mode = os.stat(os.path.join(e.work_dir, "data.json")).st_mode & 0o777
+        assert mode == 0o664
+    finally:
+        os.umask(old_umask)
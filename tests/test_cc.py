@@ -16,8 +16,11 @@
 import os
 import pytest
 import re
+import subprocess
+import unittest.mock
 
 from clade import Clade
+from clade.intercept import intercept
 from clade.extensions.opts import cc_preprocessor_opts
 
 
@@ -169,3 +172,93 @@ def test_cc_preprocess(tmpdir, cmds_file):
     e = c.parse("CC")
 
     assert e.get_all_pre_files()
+
+
+def test_cc_linker_deps(tmpdir, cmds_file):
+    c = Clade(tmpdir, cmds_file)
+
+    with unittest.mock.patch("subprocess.call", wraps=subprocess.call) as call_mock:
+        e = c.parse("CC")
+
+    linker_cmds = [
+        cmd for cmd in e.load_all_cmds(with_deps=True)
+        if all(cmd_in.endswith(".o") for cmd_in in cmd["in"])
+    ]
+    assert linker_cmds
+
+    for cmd in linker_cmds:
+        assert not cmd["deps"]
+
+    # Compiler must not be executed with -M option on object files
+    assert call_mock.called
+    for call in call_mock.call_args_list:
+        assert not call[0][0][-1].endswith(".o")
+
+
+def test_cc_load_deps_buckets_once(tmpdir, cmds_file):
+    c = Clade(tmpdir, cmds_file)
+    e = c.parse("CC")
+
+    cmds = list(e.load_all_cmds())
+    buckets = {e.get_deps_bucket(cmd["id"]) for cmd in cmds}
+
+    def deps_loads(load_data_mock):
+        return [x for x in load_data_mock.call_args_list if x[0][0].startswith(e.deps_dir)]
+
+    with unittest.mock.patch.object(e, "load_data", wraps=e.load_data) as load_data_mock:
+        assert len(list(e.load_all_cmds(with_deps=True))) == len(cmds)
+        assert len(deps_loads(load_data_mock)) == len(buckets)
+
+    # Only a single bucket is kept in memory
+    e.deps_cache_size = 1
+
+    with unittest.mock.patch.object(e, "load_data", wraps=e.load_data) as load_data_mock:
+        for cmd in sorted(cmds, key=lambda x: e.get_deps_bucket(x["id"])):
+            for _ in range(2):
+                e.load_deps_by_id(cmd["id"])
+
+        assert len(deps_loads(load_data_mock)) == len(buckets)
+
+
+def test_cc_deps_with_phony_targets(tmpdir):
+    src_dir = os.path.join(str(tmpdir), "src")
+    os.makedirs(src_dir)
+
+    with open(os.path.join(src_dir, "h.h"), "w") as fh:
+        fh.write("int h;\n")
+
+    with open(os.path.join(src_dir, "m.c"), "w") as fh:
+        fh.write('#include "h.h"\n')
+
+    # -MP adds an empty rule for each header: "h.h:"
+    cmds_file = os.path.join(str(tmpdir), "cmds.txt")
+    intercept(command=["gcc", "-MD", "-MP", "-c", "m.c"], cwd=src_dir, output=cmds_file)
+
+    c = Clade(os.path.join(str(tmpdir), "clade"), cmds_file)
+    e = c.parse("CC")
+
+    cmds = list(e.load_all_cmds(with_deps=True))
+    assert len(cmds) == 1
+    assert "m.c" in cmds[0]["deps"]
+    assert "h.h" in cmds[0]["deps"]
+
+    for dep in cmds[0]["deps"]:
+        assert not dep.endswith(":")
+
+
+def test_cc_store_deps_with_encoding(tmpdir, cmds_file):
+    conf = {
+        "Compiler.store_deps": True,
+        "Compiler.deps_encoding": "utf-8",
+        "Storage.convert_to_utf8": True,
+    }
+
+    c = Clade(tmpdir, cmds_file, conf)
+    e = c.parse("CC")
+
+    for cmd in e.load_all_cmds(with_deps=True, compile_only=True):
+        for file in cmd["deps"]:
+            if not os.path.isabs(file):
+                file = os.path.join(cmd["cwd"], file)
+
+            assert os.path.exists(c.get_storage_path(file))
@@ -39,6 +39,14 @@ def test_iter_by_which(cmds_file):
     assert len(list(iter_cmds_by_which(cmds_file, [gcc_which]))) >= number_of_gcc_cmds
 
 
+def test_iter_by_which_list(cmds_file):
+    gcc_cmds = list(iter_cmds_by_which(cmds_file, [gcc_which]))
+    cmds = list(iter_cmds_by_which(cmds_file, ["do_not_exist", gcc_which]))
+
+    assert cmds == gcc_cmds
+    assert not list(iter_cmds_by_which(cmds_file, []))
+
+
 def test_get_build_dir(cmds_file):
     assert get_build_dir(cmds_file) == os.getcwd()
 
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import os
+import pytest
 import shutil
 import unittest.mock
 
@@ -42,3 +43,31 @@ def test_storage_with_conversion(tmpdir):
     with unittest.mock.patch("os.replace") as replace_mock:
         replace_mock.side_effect = OSError
         c.add_file_to_storage(test_file)
+
+
+def test_storage_add_files(tmpdir):
+    c = Clade(tmpdir)
+
+    c.Storage.add_files([__file__, test_file, "do_not_exist.c"])
+    assert os.path.exists(c.get_storage_path(__file__))
+    assert os.path.exists(c.get_storage_path(test_file))
+    assert not os.path.exists(c.get_storage_path("do_not_exist.c"))
+
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("cp1251", "// Комментарий\nint x;\n".encode("utf-8")),
+    # Files that can't be decoded are stored as is
+    ("utf-8", "// Комментарий\r\nint x;\r\n".encode("cp1251")),
+    ("ascii", "// Комментарий\r\nint x;\r\n".encode("cp1251")),
+    ("no-such-encoding", "// Комментарий\r\nint x;\r\n".encode("cp1251")),
+])
+def test_storage_add_files_with_encoding(tmpdir, encoding, expected):
+    src_file = os.path.join(str(tmpdir), "cp1251.c")
+    with open(src_file, "wb") as fh:
+        fh.write("// Комментарий\r\nint x;\r\n".encode("cp1251"))
+
+    c = Clade(os.path.join(str(tmpdir), "clade"), conf={"Storage.convert_to_utf8": True})
+    c.Storage.add_files([src_file], encoding=encoding)
+
+    with open(c.get_storage_path(src_file), "rb") as fh:
+        assert fh.read() == expected